@@ -8,6 +8,7 @@ from pycas.cas_reader import (
     CASReader,
     Chunk,
     ChunkHeader,
+    ChunkInfo,
     ChunkType,
     read_cas_file,
     parse_chunk_selection,
@@ -21,6 +22,7 @@ __all__ = [
     "CASReader",
     "Chunk",
     "ChunkHeader",
+    "ChunkInfo",
     "ChunkType",
     "read_cas_file",
     "parse_chunk_selection",
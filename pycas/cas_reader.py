@@ -3,11 +3,36 @@ CAS File Reader for Atari 8-bit Cassette Files
 Pure Python implementation for reading CAS files and converting to byte arrays.
 """
 
+import mmap
+import os
+import re
 import struct
-from typing import List, Dict, Optional, Tuple
+from array import array
+from typing import Iterator, List, Dict, NamedTuple, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
+# Optional JIT acceleration for the structural scan; the reader falls
+# back to pure Python when numba/numpy are not installed
+try:
+    import numpy as _np
+    from numba import njit as _njit
+except ImportError:
+    _np = None
+
+# Precompiled struct formats for chunk headers (packed type tag +
+# length + aux_data) and single little-endian u16 fields
+_IHH = struct.Struct('<IHH')
+_U16 = struct.Struct('<H')
+
+# Translation table mapping non-printable bytes to '.' for ASCII dumps
+_ASCII_TABLE = bytes(i if 32 <= i < 127 else 0x2E for i in range(256))
+
+# Matches one element of a chunk selection: an index or an index range,
+# followed by a comma introducing the next element or the end of the
+# spec (so a trailing comma is rejected as malformed)
+_SEL_RE = re.compile(r'\s*(\d+)(?:\s*-\s*(\d+))?\s*(?:,(?=\s*\d)|$)')
+
 
 class ChunkType(Enum):
     """CAS file chunk types"""
@@ -21,6 +46,84 @@ class ChunkType(Enum):
     PWML = b'pwml'  # Raw PWM state sequence
 
 
+# Cached chunk-type tags; enum attribute access is too costly for the
+# per-chunk loops below
+_DATA = ChunkType.DATA.value
+_FUJI = ChunkType.FUJI.value
+_BAUD = ChunkType.BAUD.value
+
+# Type tags packed as little-endian uint32, so tag comparison and
+# dispatch are single machine-word operations instead of 4-byte compares
+_TAG_INT = {int.from_bytes(t.value, 'little'): t for t in ChunkType}
+_DATA_INT = int.from_bytes(_DATA, 'little')
+_FUJI_INT = int.from_bytes(_FUJI, 'little')
+_BAUD_INT = int.from_bytes(_BAUD, 'little')
+
+
+def _tag_to_bytes(tag: int) -> bytes:
+    """Unpack a uint32 type tag back into its 4-byte form"""
+    chunk_type = _TAG_INT.get(tag)
+    if chunk_type is not None:
+        return chunk_type.value
+    return tag.to_bytes(4, 'little')
+
+
+def _handle_fuji(data, metadata: Dict) -> None:
+    """Record the tape description from a FUJI chunk"""
+    data = bytes(data)
+    try:
+        metadata['description'] = data.decode('utf-8')
+    except UnicodeDecodeError:
+        metadata['description'] = data.decode('latin-1', errors='ignore')
+
+
+def _handle_baud(data, metadata: Dict) -> None:
+    """Record the baudrate from a baud chunk"""
+    if len(data) >= 2:
+        metadata['baudrate'] = _U16.unpack_from(data, 0)[0]
+
+
+# Per-chunk-type metadata handlers, dispatched by packed tag in one
+# hash lookup instead of a sequential if/elif chain
+_HANDLERS = {
+    _FUJI_INT: _handle_fuji,
+    _BAUD_INT: _handle_baud,
+}
+
+
+if _np is not None:
+    @_njit(cache=True)
+    def _scan_chunks(buf):
+        """Structural scan of a CAS buffer (JIT-compiled).
+
+        Walks the chunk headers in a uint8 array and returns parallel
+        arrays of packed type tags, data offsets, lengths and aux words,
+        plus the number of chunks found.
+        """
+        n = buf.shape[0]
+        max_chunks = n // 8
+        tags = _np.empty(max_chunks, dtype=_np.uint32)
+        offsets = _np.empty(max_chunks, dtype=_np.uint64)
+        lengths = _np.empty(max_chunks, dtype=_np.uint16)
+        aux = _np.empty(max_chunks, dtype=_np.uint16)
+
+        count = 0
+        offset = 0
+        while offset + 8 <= n:
+            length = buf[offset+4] | (buf[offset+5] << 8)
+            if offset + 8 + length > n:
+                break
+            tags[count] = (buf[offset] | (buf[offset+1] << 8) |
+                           (buf[offset+2] << 16) | (buf[offset+3] << 24))
+            lengths[count] = length
+            aux[count] = buf[offset+6] | (buf[offset+7] << 8)
+            offsets[count] = offset + 8
+            count += 1
+            offset += 8 + length
+
+        return tags, offsets, lengths, aux, count
+
+
 @dataclass
 class ChunkHeader:
     """CAS chunk header structure (8 bytes)"""
@@ -29,114 +132,324 @@ class ChunkHeader:
     aux_data: int      # 2-byte auxiliary data (little-endian)
 
 
+class ChunkInfo(NamedTuple):
+    """Summary of a single chunk as reported by get_chunk_info"""
+    index: int
+    type: str
+    length: int
+    aux_data: int
+
+
 @dataclass
 class Chunk:
-    """Complete CAS chunk with header and data"""
+    """Complete CAS chunk with header and data
+
+    Note: data is a zero-copy memoryview into the file buffer held by the
+    CASReader; wrap it in bytes() if an independent copy is needed.
+    """
     header: ChunkHeader
-    data: bytes
+    data: Union[bytes, memoryview]
+
+
+class _ChunkSequence:
+    """Lazy read-only sequence of Chunks backed by a CASReader's
+    structure-of-arrays storage.
+
+    Chunk/ChunkHeader objects are materialized on access instead of being
+    allocated up front for every record in the file.
+    """
+
+    def __init__(self, reader: 'CASReader'):
+        self._reader = reader
+
+    def __len__(self) -> int:
+        return len(self._reader._lengths)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Chunk, List[Chunk]]:
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError('chunk index out of range')
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[Chunk]:
+        for i in range(len(self)):
+            yield self._materialize(i)
+
+    def _materialize(self, i: int) -> Chunk:
+        r = self._reader
+        offset = r._offsets[i]
+        length = r._lengths[i]
+        header = ChunkHeader(_tag_to_bytes(r._tags[i]), length, r._aux[i])
+        return Chunk(header, r._mv[offset:offset+length])
 
 
 class CASReader:
-    """Reader for CAS (Atari 8-bit cassette) files"""
+    """Reader for CAS (Atari 8-bit cassette) files
+
+    Chunk records are stored as parallel arrays (type tags, lengths,
+    aux words, and data offsets into the raw file buffer) rather than
+    one object per chunk; the `chunks` attribute materializes Chunk
+    views on demand.
+    """
 
     def __init__(self, filepath: str):
         self.filepath = filepath
-        self.chunks: List[Chunk] = []
+        self.chunks = _ChunkSequence(self)
         self.data_blocks: List[bytes] = []
+        # Structure-of-arrays chunk storage; type tags packed as uint32
+        self._tags = array('I')
+        self._lengths = array('H')
+        self._aux = array('H')
+        self._offsets = array('Q')
+        # NumPy views of the same arrays, kept when the JIT scan ran so
+        # per-type filtering can be vectorized
+        self._np_tags = None
+        self._np_lengths = None
+        self._np_offsets = None
+        # Metadata fields collected by the handler dispatch during read()
+        self._scan_metadata: Dict = {'description': None, 'baudrate': 600}
+        # Memoized results, invalidated whenever read() reparses
+        self._byte_array_cache: Optional[bytearray] = None
+        self._metadata_cache: Optional[Dict] = None
+        # Underlying file buffer (mmap for non-empty files); kept alive
+        # so chunk data views stay valid
+        self._file_data = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._mv: Optional[memoryview] = None
 
     def read(self) -> None:
-        """Read and parse the CAS file"""
-        with open(self.filepath, 'rb') as f:
-            file_data = f.read()
+        """Read and parse the CAS file
 
-        offset = 0
-        while offset < len(file_data):
-            # Read chunk header (8 bytes)
-            if offset + 8 > len(file_data):
-                break
-
-            chunk_type = file_data[offset:offset+4]
-            length = struct.unpack('<H', file_data[offset+4:offset+6])[0]
-            aux_data = struct.unpack('<H', file_data[offset+6:offset+8])[0]
-
-            header = ChunkHeader(chunk_type, length, aux_data)
-            offset += 8
-
-            # Read chunk data
-            if offset + length > len(file_data):
-                break
+        The file is memory-mapped rather than read into a Python bytes
+        object, so the OS pages it in on demand and chunk data views
+        cost no copies. The mapping stays open until close() is called
+        (or the reader is used as a context manager).
+        """
+        self.close()
 
-            chunk_data = file_data[offset:offset+length]
-            offset += length
+        with open(self.filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap rejects empty files
+                file_data = b''
+            else:
+                file_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._mmap = file_data
+
+        # Keep the buffer alive and slice through a memoryview so chunk
+        # data never gets copied out of it
+        self._file_data = file_data
+        mv = memoryview(file_data)
+        self._mv = mv
+
+        # Reset any state from a previous read
+        self._byte_array_cache = None
+        self._metadata_cache = None
+        self._tags = array('I')
+        self._lengths = array('H')
+        self._aux = array('H')
+        self._offsets = array('Q')
+        self._np_tags = None
+        self._np_lengths = None
+        self._np_offsets = None
+
+        if _np is not None:
+            # JIT-compiled structural scan; copy the result arrays into
+            # the structure-of-arrays storage at C speed
+            buf = _np.frombuffer(file_data, dtype=_np.uint8)
+            tags, offsets, lengths, aux, count = _scan_chunks(buf)
+            self._tags.frombytes(tags[:count].tobytes())
+            self._lengths.frombytes(lengths[:count].tobytes())
+            self._aux.frombytes(aux[:count].tobytes())
+            self._offsets.frombytes(offsets[:count].tobytes())
+            self._np_tags = tags[:count]
+            self._np_lengths = lengths[:count]
+            self._np_offsets = offsets[:count]
+        else:
+            # Hoist bound methods out of the loop to skip per-iteration
+            # attribute lookups
+            tags_append = self._tags.append
+            lengths_append = self._lengths.append
+            aux_append = self._aux.append
+            offsets_append = self._offsets.append
+            hdr_unpack = _IHH.unpack_from
+
+            offset = 0
+            while offset < len(file_data):
+                # Read chunk header (8 bytes)
+                if offset + 8 > len(file_data):
+                    break
+
+                tag, length, aux_data = hdr_unpack(mv, offset)
+                offset += 8
+
+                # Check chunk data bounds
+                if offset + length > len(file_data):
+                    break
+
+                tags_append(tag)
+                lengths_append(length)
+                aux_append(aux_data)
+                offsets_append(offset)
+
+                offset += length
+
+        # Single table-driven pass: collect data blocks and dispatch
+        # metadata handlers by packed tag
+        metadata = {'description': None, 'baudrate': 600}
+        tags = self._tags
+        lengths = self._lengths
+        offsets = self._offsets
+
+        if self._np_tags is not None:
+            # Vectorized filtering: only visit the chunks that matter
+            # instead of branching on every record in Python
+            np_tags = self._np_tags
+            data_blocks = [
+                mv[offsets[i]:offsets[i]+lengths[i]]
+                for i in _np.flatnonzero(np_tags == _DATA_INT).tolist()
+            ]
+            handled = (np_tags == _FUJI_INT) | (np_tags == _BAUD_INT)
+            for i in _np.flatnonzero(handled).tolist():
+                offset = offsets[i]
+                _HANDLERS[tags[i]](mv[offset:offset+lengths[i]], metadata)
+        else:
+            data_blocks = []
+            data_blocks_append = data_blocks.append
+            get_handler = _HANDLERS.get
+            for i in range(len(tags)):
+                tag = tags[i]
+                if tag == _DATA_INT:
+                    offset = offsets[i]
+                    data_blocks_append(mv[offset:offset+lengths[i]])
+                else:
+                    handler = get_handler(tag)
+                    if handler:
+                        offset = offsets[i]
+                        handler(mv[offset:offset+lengths[i]], metadata)
+
+        self.data_blocks = data_blocks
+        self._scan_metadata = metadata
+
+    def close(self) -> None:
+        """Release the memory-mapped file buffer
+
+        Any Chunk data or data block views handed out by this reader
+        become invalid; closing raises BufferError if a caller still
+        holds one.
+        """
+        self.data_blocks = []
+        self._mv = None
+        self._file_data = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
 
-            chunk = Chunk(header, chunk_data)
-            self.chunks.append(chunk)
+    def __enter__(self) -> 'CASReader':
+        return self
 
-            # Extract data blocks from 'data' chunks
-            if chunk_type == ChunkType.DATA.value:
-                self.data_blocks.append(chunk_data)
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
     def to_byte_array(self) -> bytearray:
         """Convert all data chunks to a single byte array"""
-        result = bytearray()
-
-        for chunk in self.chunks:
-            if chunk.header.chunk_type == ChunkType.DATA.value:
-                result.extend(chunk.data)
-
+        if self._byte_array_cache is not None:
+            return self._byte_array_cache
+
+        mv = self._mv
+        tags = self._tags
+        lengths = self._lengths
+        offsets = self._offsets
+
+        if self._np_tags is not None:
+            # Vectorized: mask out the data chunks and sum their sizes
+            # without branching on every record in Python
+            data_idx = _np.flatnonzero(self._np_tags == _DATA_INT)
+            total = int(self._np_lengths[data_idx].sum())
+            result = bytearray(total)
+
+            pos = 0
+            for i in data_idx.tolist():
+                n = lengths[i]
+                offset = offsets[i]
+                result[pos:pos+n] = mv[offset:offset+n]
+                pos += n
+        else:
+            # Preallocate the full buffer so filling it never reallocates
+            total = sum(lengths[i] for i in range(len(tags)) if tags[i] == _DATA_INT)
+            result = bytearray(total)
+
+            pos = 0
+            for i in range(len(tags)):
+                if tags[i] == _DATA_INT:
+                    n = lengths[i]
+                    offset = offsets[i]
+                    result[pos:pos+n] = mv[offset:offset+n]
+                    pos += n
+
+        self._byte_array_cache = result
         return result
 
     def get_all_chunks_as_bytes(self) -> bytearray:
         """Convert entire CAS file (all chunks) to byte array"""
-        result = bytearray()
-
-        for chunk in self.chunks:
+        mv = self._mv
+        tags = self._tags
+        lengths = self._lengths
+        aux = self._aux
+        offsets = self._offsets
+
+        # Preallocate: 8 header bytes plus payload per chunk
+        total = 8 * len(tags) + sum(lengths)
+        result = bytearray(total)
+        hdr_pack = _IHH.pack_into
+
+        pos = 0
+        for i in range(len(tags)):
             # Add header
-            result.extend(chunk.header.chunk_type)
-            result.extend(struct.pack('<H', chunk.header.length))
-            result.extend(struct.pack('<H', chunk.header.aux_data))
+            n = lengths[i]
+            hdr_pack(result, pos, tags[i], n, aux[i])
+            pos += 8
             # Add data
-            result.extend(chunk.data)
+            offset = offsets[i]
+            result[pos:pos+n] = mv[offset:offset+n]
+            pos += n
 
         return result
 
     def get_metadata(self) -> Dict:
         """Extract metadata from CAS file"""
+        if self._metadata_cache is not None:
+            return self._metadata_cache
+
+        # The per-chunk-type fields were already collected by the
+        # handler dispatch in read()
         metadata = {
-            'description': None,
-            'baudrate': 600,  # default
+            'description': self._scan_metadata['description'],
+            'baudrate': self._scan_metadata['baudrate'],
             'chunk_count': len(self.chunks),
             'data_block_count': len(self.data_blocks)
         }
-
-        for chunk in self.chunks:
-            if chunk.header.chunk_type == ChunkType.FUJI.value:
-                try:
-                    metadata['description'] = chunk.data.decode('utf-8')
-                except UnicodeDecodeError:
-                    metadata['description'] = chunk.data.decode('latin-1', errors='ignore')
-            elif chunk.header.chunk_type == ChunkType.BAUD.value:
-                if len(chunk.data) >= 2:
-                    metadata['baudrate'] = struct.unpack('<H', chunk.data[:2])[0]
-
+        self._metadata_cache = metadata
         return metadata
 
-    def get_data_blocks(self) -> List[bytes]:
-        """Get list of all data blocks"""
-        return self.data_blocks.copy()
+    def get_data_blocks(self) -> Tuple[bytes, ...]:
+        """Get all data blocks as an immutable sequence"""
+        return tuple(self.data_blocks)
 
-    def get_chunk_info(self) -> List[Dict]:
+    def get_chunk_info(self) -> List[ChunkInfo]:
         """Get information about all chunks"""
-        info = []
-        for i, chunk in enumerate(self.chunks):
-            chunk_info = {
-                'index': i,
-                'type': chunk.header.chunk_type.decode('ascii', errors='ignore'),
-                'length': chunk.header.length,
-                'aux_data': chunk.header.aux_data
-            }
-            info.append(chunk_info)
-        return info
+        return [
+            ChunkInfo(
+                index=i,
+                type=_tag_to_bytes(self._tags[i]).decode('ascii', errors='ignore'),
+                length=self._lengths[i],
+                aux_data=self._aux[i]
+            )
+            for i in range(len(self._tags))
+        ]
 
     def to_bin_file(self, output_path: str) -> int:
         """
@@ -148,10 +461,22 @@ class CASReader:
         Returns:
             Number of bytes written
         """
-        byte_array = self.to_byte_array()
+        # Stream data blocks straight to disk instead of materializing
+        # the full byte array in memory first
+        mv = self._mv
+        tags = self._tags
+        lengths = self._lengths
+        offsets = self._offsets
+
+        bytes_written = 0
         with open(output_path, 'wb') as f:
-            f.write(byte_array)
-        return len(byte_array)
+            for i in range(len(tags)):
+                if tags[i] == _DATA_INT:
+                    n = lengths[i]
+                    offset = offsets[i]
+                    f.write(mv[offset:offset+n])
+                    bytes_written += n
+        return bytes_written
 
     def dump_chunks(self, chunk_indices: Optional[List[int]] = None,
                     show_hex: bool = True, show_ascii: bool = False) -> str:
@@ -188,19 +513,21 @@ class CASReader:
                 output_lines.append("  (empty)")
             else:
                 for offset in range(0, len(data), 16):
-                    line_data = data[offset:offset+16]
+                    line_data = bytes(data[offset:offset+16])
 
                     # Build line
                     line_parts = [f"{offset:04x}:"]
 
                     if show_hex:
-                        hex_part = ' '.join(f'{b:02x}' for b in line_data)
+                        # bytes.hex(sep) and bytes.translate do the
+                        # per-byte work in C instead of the interpreter
+                        hex_part = line_data.hex(' ')
                         # Pad to align ASCII section
                         hex_part = hex_part.ljust(48)
                         line_parts.append(hex_part)
 
                     if show_ascii:
-                        ascii_part = ''.join(chr(b) if 32 <= b < 127 else '.' for b in line_data)
+                        ascii_part = line_data.translate(_ASCII_TABLE).decode('ascii')
                         if show_hex:
                             line_parts.append('|')
                         line_parts.append(ascii_part)
@@ -226,26 +553,27 @@ def parse_chunk_selection(chunk_spec: str, max_chunks: int) -> List[int]:
     if not chunk_spec:
         return list(range(max_chunks))
 
-    indices = set()
-    parts = chunk_spec.split(',')
-
-    for part in parts:
-        part = part.strip()
-        if '-' in part:
-            # Range: "0-5"
-            start, end = part.split('-', 1)
-            start_idx = int(start.strip())
-            end_idx = int(end.strip())
-            for i in range(start_idx, end_idx + 1):
-                if 0 <= i < max_chunks:
-                    indices.add(i)
-        else:
-            # Single index: "3"
-            idx = int(part)
-            if 0 <= idx < max_chunks:
-                indices.add(idx)
+    # Single regex pass extracts indices and ranges alike; a boolean
+    # mask replaces the set + sort for producing ordered indices
+    mask = bytearray(max_chunks)
+    pos = 0
+    for m in _SEL_RE.finditer(chunk_spec):
+        if m.start() != pos:
+            raise ValueError(f"invalid chunk selection: {chunk_spec!r}")
+        pos = m.end()
+
+        start_idx = int(m.group(1))
+        end_idx = int(m.group(2)) if m.group(2) else start_idx
+        # Clamp the range to the available chunks
+        start_idx = max(start_idx, 0)
+        end_idx = min(end_idx, max_chunks - 1)
+        if start_idx <= end_idx:
+            mask[start_idx:end_idx+1] = b'\x01' * (end_idx - start_idx + 1)
+
+    if pos != len(chunk_spec):
+        raise ValueError(f"invalid chunk selection: {chunk_spec!r}")
 
-    return sorted(list(indices))
+    return [i for i, selected in enumerate(mask) if selected]
 
 
 def read_cas_file(filepath: str) -> Tuple[bytearray, Dict]:
@@ -357,7 +685,7 @@ Examples:
 
         print(f"\nChunks:")
         for chunk_info in reader.get_chunk_info():
-            print(f"  [{chunk_info['index']}] {chunk_info['type']}: {chunk_info['length']} bytes (aux: {chunk_info['aux_data']})")
+            print(f"  [{chunk_info.index}] {chunk_info.type}: {chunk_info.length} bytes (aux: {chunk_info.aux_data})")
 
         byte_array = reader.to_byte_array()
         print(f"\nTotal data bytes: {len(byte_array)}")